@@ -11,7 +11,7 @@ from typing import Annotated, Any
 
 import structlog
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Query, Request, Security
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Security
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.security import APIKeyHeader
@@ -212,12 +212,7 @@ async def lifespan(app: FastAPI):
         logger.debug("shopmonkey_client_closed")
 
 
-app = FastAPI(
-    title="Shopmonkey Scheduling API",
-    description="APIs for listing bookable services, checking availability, and booking appointments",
-    version="1.0.0",
-    lifespan=lifespan,
-)
+router = APIRouter()
 
 
 # CORS middleware configuration
@@ -231,26 +226,7 @@ def get_cors_origins() -> list[str]:
     return [origin.strip() for origin in origins_str.split(",") if origin.strip()]
 
 
-allowed_origins = get_cors_origins()
-if allowed_origins:
-    # Only add CORS middleware if origins are configured
-    cors_config = {
-        "allow_origins": allowed_origins,
-        "allow_methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["*"],
-    }
-    # Don't allow credentials with wildcard origins (security issue)
-    if allowed_origins != ["*"]:
-        cors_config["allow_credentials"] = True
-
-    app.add_middleware(CORSMiddleware, **cors_config)
-    logger.info("cors_configured", origins=allowed_origins)
-else:
-    logger.info("cors_disabled", reason="ALLOWED_ORIGINS not set")
-
-
 # Request logging middleware
-@app.middleware("http")
 async def request_logging_middleware(request: Request, call_next):
     """Log all HTTP requests with timing and request ID."""
     request_id = str(uuid.uuid4())[:8]
@@ -276,10 +252,8 @@ async def request_logging_middleware(request: Request, call_next):
     return response
 
 
-# Mount static files directory
+# Static files directory (widget assets)
 static_dir = os.path.join(os.path.dirname(__file__), "static")
-if os.path.exists(static_dir):
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 
 # Request/Response Models
@@ -457,7 +431,7 @@ async def get_qualified_techs_for_service(
 
 
 # API Endpoints
-@app.get("/services", response_model=ServicesListResponse)
+@router.get("/services", response_model=ServicesListResponse)
 async def list_services(_: ApiKeyDep):
     """
     List all bookable canned services from Shopmonkey.
@@ -508,7 +482,7 @@ async def list_services(_: ApiKeyDep):
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
 
-@app.get("/availability", response_model=AvailabilityResponse)
+@router.get("/availability", response_model=AvailabilityResponse)
 async def get_availability(
     _: ApiKeyDep,
     service_id: str = Query(..., description="The ID of the service to check availability for"),
@@ -608,7 +582,7 @@ async def get_availability(
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
 
-@app.post("/book", response_model=BookingResponse)
+@router.post("/book", response_model=BookingResponse)
 async def book_appointment(_: ApiKeyDep, request: BookingRequest):
     """
     Book an appointment for a service at a specific time slot.
@@ -788,8 +762,8 @@ Booked online via scheduling API."""
             raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
 
-@app.get("/")
-@app.get("/schedule")
+@router.get("/")
+@router.get("/schedule")
 async def schedule_page():
     """Serve the scheduling widget page."""
     widget_path = os.path.join(static_dir, "widget.html")
@@ -799,7 +773,7 @@ async def schedule_page():
 
 
 # Health check endpoints
-@app.get("/health", response_model=HealthResponse)
+@router.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Basic liveness probe for Cloud Run / Kubernetes.
@@ -809,7 +783,7 @@ async def health_check():
     return HealthResponse(status="healthy")
 
 
-@app.get("/health/live", response_model=HealthResponse)
+@router.get("/health/live", response_model=HealthResponse)
 async def liveness_check():
     """
     Liveness probe - always returns 200 if the application is running.
@@ -819,7 +793,7 @@ async def liveness_check():
     return HealthResponse(status="healthy")
 
 
-@app.get("/health/ready", response_model=ReadinessResponse)
+@router.get("/health/ready", response_model=ReadinessResponse)
 async def readiness_check():
     """
     Readiness probe - checks if dependencies are available.
@@ -864,6 +838,56 @@ async def readiness_check():
     return response
 
 
+def create_app(enable_docs: bool = True) -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Args:
+        enable_docs: Serve the OpenAPI schema, Swagger UI and ReDoc. Tests that
+            never touch them can pass False to skip registering those routes.
+    """
+    docs_kwargs: dict[str, Any] = {}
+    if not enable_docs:
+        docs_kwargs = {"openapi_url": None, "docs_url": None, "redoc_url": None}
+
+    app = FastAPI(
+        title="Shopmonkey Scheduling API",
+        description="APIs for listing bookable services, checking availability, and booking appointments",
+        version="1.0.0",
+        lifespan=lifespan,
+        **docs_kwargs,
+    )
+
+    allowed_origins = get_cors_origins()
+    if allowed_origins:
+        # Only add CORS middleware if origins are configured
+        cors_config = {
+            "allow_origins": allowed_origins,
+            "allow_methods": ["GET", "POST", "OPTIONS"],
+            "allow_headers": ["*"],
+        }
+        # Don't allow credentials with wildcard origins (security issue)
+        if allowed_origins != ["*"]:
+            cors_config["allow_credentials"] = True
+
+        app.add_middleware(CORSMiddleware, **cors_config)
+        logger.info("cors_configured", origins=allowed_origins)
+    else:
+        logger.info("cors_disabled", reason="ALLOWED_ORIGINS not set")
+
+    app.middleware("http")(request_logging_middleware)
+
+    # Mount static files directory
+    if os.path.exists(static_dir):
+        app.mount("/static", StaticFiles(directory=static_dir), name="static")
+
+    app.include_router(router)
+    return app
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -2,7 +2,9 @@
 
 import asyncio
 import os
+from collections.abc import Iterator
 from functools import lru_cache
+from itertools import islice, zip_longest
 
 import structlog
 from cachetools import TTLCache
@@ -14,6 +16,54 @@ logger = structlog.get_logger(__name__)
 # Default cache TTL in seconds (5 minutes)
 DEFAULT_CACHE_TTL = 300
 
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+# Tech/Dept cell values from the old boolean format (compared after strip/upper)
+QUALIFIED_VALUES = frozenset({"TRUE", "YES", "X"})
+NOT_QUALIFIED_VALUES = frozenset({"FALSE", "NO", ""})
+
+
+@lru_cache(maxsize=256)
+def _parse_priority(cell: str) -> int:
+    """
+    Convert a Tech/Dept cell to a department priority (0=not qualified).
+
+    Supports both the old boolean format and the new priority format. Sheets
+    only use a handful of distinct values, so each is parsed once.
+    """
+    value = cell.strip().upper()
+    if value in QUALIFIED_VALUES:
+        return 1  # Treat as priority 1
+    if value in NOT_QUALIFIED_VALUES:
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=4)
+def _build_service(credentials_path: str | None):
+    """
+    Build a Sheets API service, shared by every client using the same credentials.
+
+    Loading credentials and building the discovery-based service is the
+    expensive part of client setup, so it is done once per credentials path.
+    """
+    if credentials_path:
+        credentials = service_account.Credentials.from_service_account_file(
+            credentials_path,
+            scopes=SCOPES,
+        )
+    else:
+        # Use Application Default Credentials (ADC) - works on Cloud Run
+        from google.auth import default
+
+        credentials, _ = default(scopes=SCOPES)
+
+    # The bundled discovery document is used, so there is nothing to cache on disk
+    return build("sheets", "v4", credentials=credentials, cache_discovery=False)
+
 
 class SheetsClient:
     """Client for reading scheduling configuration from Google Sheets."""
@@ -22,6 +72,15 @@ class SheetsClient:
     SERVICE_DEPARTMENTS_TAB = "Bookable Canned Services"  # Legacy - no longer used (using Shopmonkey labels)
     TECH_DEPARTMENTS_TAB = "Tech/Dept"
 
+    # Department columns start at column D in the Tech/Dept tab
+    DEPT_START_INDEX = 3
+
+    # Mapping from service department names to tech department column names
+    DEPARTMENT_MAPPING = {
+        "Alignment/Tech": "Alignment",
+        # Add other mappings as needed
+    }
+
     def __init__(
         self,
         spreadsheet_id: str | None = None,
@@ -49,20 +108,7 @@ class SheetsClient:
 
     def _get_service(self):
         if self._service is None:
-            if self.credentials_path:
-                credentials = service_account.Credentials.from_service_account_file(
-                    self.credentials_path,
-                    scopes=["https://www.googleapis.com/auth/spreadsheets"],
-                )
-            else:
-                # Use Application Default Credentials (ADC) - works on Cloud Run
-                from google.auth import default
-
-                credentials, _ = default(
-                    scopes=["https://www.googleapis.com/auth/spreadsheets"]
-                )
-
-            self._service = build("sheets", "v4", credentials=credentials)
+            self._service = _build_service(self.credentials_path)
         return self._service
 
     def _sync_read_sheet(self, range_name: str, use_cache: bool = True) -> list[list[str]]:
@@ -140,13 +186,7 @@ class SheetsClient:
         - "Alignment/Tech" -> "Alignment"
         - "Ceramic/Paint Restoration" -> (no match, could map to Vinyl or similar)
         """
-        # Mapping from service department names to tech department column names
-        dept_mapping = {
-            "Alignment/Tech": "Alignment",
-            # Add other mappings as needed
-        }
-
-        return dept_mapping.get(department, department)
+        return self.DEPARTMENT_MAPPING.get(department, department)
 
     def _sync_get_department_for_service(self, service_name: str) -> str | None:
         """Synchronous implementation of get_department_for_service."""
@@ -160,80 +200,88 @@ class SheetsClient:
         """Get the normalized department for a specific service name."""
         return await asyncio.to_thread(self._sync_get_department_for_service, service_name)
 
-    def _sync_get_tech_departments(self) -> dict[str, dict]:
-        """Synchronous implementation of get_tech_departments."""
-        logger.debug("fetching_tech_departments")
-        range_name = f"'{self.TECH_DEPARTMENTS_TAB}'!A:Z"
-        rows = self._sync_read_sheet(range_name)
-
-        if not rows or len(rows) < 2:
-            return {}
+    def _parse_tech_dept_header(self, header: list[str]) -> tuple[list[str], int | None]:
+        """
+        Parse the Tech/Dept header row.
 
-        # First row is header
-        # Columns: Name (A), ID (B), Primary Role (C), Departments (D+), Status (last)
-        header = rows[0]
+        Columns: Name (A), ID (B), Primary Role (C), Departments (D+), Status (last)
 
-        # Find department columns (between Primary Role and Status)
-        # Departments start at index 3 (column D)
-        # Status is at the last column
+        Returns:
+            Tuple of (department_names, status_col_index)
+        """
+        # Find the Status column (departments end just before it)
         status_col_index = None
         for i, col_name in enumerate(header):
             if "status" in col_name.lower():
                 status_col_index = i
                 break
 
-        # Department columns are from index 3 up to (but not including) status column
-        dept_start_index = 3
+        # Department columns are from column D up to (but not including) status column
         dept_end_index = status_col_index if status_col_index else len(header)
-        department_names = [d.strip() for d in header[dept_start_index:dept_end_index] if d.strip()]
+        department_names = [
+            d.strip() for d in header[self.DEPT_START_INDEX:dept_end_index] if d.strip()
+        ]
+        return department_names, status_col_index
 
-        result = {}
-        for row in rows[1:]:
-            if len(row) >= 2:
-                tech_name = row[0].strip()
-                tech_id = row[1].strip()
-                role = row[2].strip() if len(row) > 2 else ""
-
-                # Get status (last column) - default to Active if not found
-                status = "Active"
-                if status_col_index and len(row) > status_col_index:
-                    status = row[status_col_index].strip()
-
-                # Skip inactive technicians
-                if status.lower() != "active":
-                    continue
-
-                # Skip if no tech_id
-                if not tech_id:
-                    continue
-
-                # Parse department priorities (0=not qualified, 1+=priority, lower=higher)
-                departments = {}
-                for i, dept_name in enumerate(department_names):
-                    col_index = dept_start_index + i
-                    if col_index < len(row):
-                        value = row[col_index].strip().upper()
-                        # Support both old boolean format and new priority format
-                        if value in ("TRUE", "YES", "X"):
-                            departments[dept_name] = 1  # Treat as priority 1
-                        elif value in ("FALSE", "NO", ""):
-                            departments[dept_name] = 0  # Not qualified
-                        else:
-                            try:
-                                departments[dept_name] = int(value)
-                            except ValueError:
-                                departments[dept_name] = 0
-                    else:
-                        departments[dept_name] = 0
-
-                result[tech_id] = {
-                    "tech_name": tech_name,
-                    "role": role,
-                    "departments": departments,
-                    "status": status,
-                }
+    def _iter_tech_rows(self, rows: list[list[str]]) -> Iterator[tuple[str, dict]]:
+        """
+        Yield (tech_id, tech info) for each active tech in the Tech/Dept rows.
 
-        return result
+        Inactive techs and rows without a tech ID are skipped as they are read.
+        """
+        if not rows or len(rows) < 2:
+            return
+
+        # First row is header
+        department_names, status_col_index = self._parse_tech_dept_header(rows[0])
+        dept_start_index = self.DEPT_START_INDEX
+        dept_end_index = dept_start_index + len(department_names)
+
+        for row in islice(rows, 1, None):
+            if len(row) < 2:
+                continue
+
+            tech_name = row[0].strip()
+            tech_id = row[1].strip()
+            role = row[2].strip() if len(row) > 2 else ""
+
+            # Get status (last column) - default to Active if not found
+            status = "Active"
+            if status_col_index and len(row) > status_col_index:
+                status = row[status_col_index].strip()
+
+            # Skip inactive technicians
+            if status.lower() != "active":
+                continue
+
+            # Skip if no tech_id
+            if not tech_id:
+                continue
+
+            # Parse department priorities (0=not qualified, 1+=priority, lower=higher)
+            # Slice the department cells once; short rows are padded with ""
+            dept_cells = row[dept_start_index:dept_end_index]
+            departments = {
+                dept_name: _parse_priority(cell)
+                for dept_name, cell in zip_longest(department_names, dept_cells, fillvalue="")
+            }
+
+            yield tech_id, {
+                "tech_name": tech_name,
+                "role": role,
+                "departments": departments,
+                "status": status,
+            }
+
+    def _parse_tech_departments(self, rows: list[list[str]]) -> dict[str, dict]:
+        """Parse Tech/Dept rows into a tech_id -> tech info mapping."""
+        return dict(self._iter_tech_rows(rows))
+
+    def _sync_get_tech_departments(self) -> dict[str, dict]:
+        """Synchronous implementation of get_tech_departments."""
+        logger.debug("fetching_tech_departments")
+        range_name = f"'{self.TECH_DEPARTMENTS_TAB}'!A:Z"
+        return self._parse_tech_departments(self._sync_read_sheet(range_name))
 
     async def get_tech_departments(self) -> dict[str, dict]:
         """
@@ -250,25 +298,43 @@ class SheetsClient:
         """
         return await asyncio.to_thread(self._sync_get_tech_departments)
 
+    def _sync_get_techs_by_department(self) -> dict[str, list[dict]]:
+        """
+        Qualified techs for every department, sorted by priority.
+
+        The index is built once per sheet read and cached next to the rows it was
+        built from, so it expires and is cleared together with them.
+        """
+        range_name = f"'{self.TECH_DEPARTMENTS_TAB}'!A:Z"
+        rows = self._sync_read_sheet(range_name)
+
+        cached = self._cache.get("techs_by_department")
+        if cached is not None and cached[0] is rows:
+            return cached[1]
+
+        techs_by_department: dict[str, list[dict]] = {}
+        for tech_id, tech_info in self._parse_tech_departments(rows).items():
+            for department, priority in tech_info["departments"].items():
+                if priority > 0:  # 0 means not qualified
+                    techs_by_department.setdefault(department, []).append(
+                        {
+                            "tech_id": tech_id,
+                            "tech_name": tech_info["tech_name"],
+                            "priority": priority,
+                        }
+                    )
+
+        # Sort by priority (1 is highest priority, lower numbers first)
+        for techs in techs_by_department.values():
+            techs.sort(key=lambda t: t["priority"])
+
+        self._cache["techs_by_department"] = (rows, techs_by_department)
+        return techs_by_department
+
     def _sync_get_techs_for_department(self, department: str) -> list[dict]:
         """Synchronous implementation of get_techs_for_department."""
         logger.debug("getting_techs_for_department", department=department)
-        tech_mappings = self._sync_get_tech_departments()
-
-        qualified_techs = []
-        for tech_id, tech_info in tech_mappings.items():
-            priority = tech_info["departments"].get(department, 0)
-            if priority > 0:  # 0 means not qualified
-                qualified_techs.append(
-                    {
-                        "tech_id": tech_id,
-                        "tech_name": tech_info["tech_name"],
-                        "priority": priority,
-                    }
-                )
-
-        # Sort by priority (1 is highest priority, lower numbers first)
-        qualified_techs.sort(key=lambda t: t["priority"])
+        qualified_techs = list(self._sync_get_techs_by_department().get(department, []))
 
         logger.debug(
             "found_qualified_techs",
@@ -292,25 +358,15 @@ class SheetsClient:
 
     def _sync_get_all_departments(self) -> list[str]:
         """Synchronous implementation of get_all_departments."""
-        range_name = f"'{self.TECH_DEPARTMENTS_TAB}'!A1:Z1"
+        # Read the same range as get_tech_departments so both share one cached fetch
+        range_name = f"'{self.TECH_DEPARTMENTS_TAB}'!A:Z"
         rows = self._sync_read_sheet(range_name)
 
         if not rows:
             return []
 
-        header = rows[0]
-
-        # Find status column to know where departments end
-        status_col_index = None
-        for i, col_name in enumerate(header):
-            if "status" in col_name.lower():
-                status_col_index = i
-                break
-
-        # Department names start from column D (index 3), up to status column
-        dept_start_index = 3
-        dept_end_index = status_col_index if status_col_index else len(header)
-        return [d.strip() for d in header[dept_start_index:dept_end_index] if d.strip()]
+        department_names, _ = self._parse_tech_dept_header(rows[0])
+        return department_names
 
     async def get_all_departments(self) -> list[str]:
         """Get list of all department names from the Tech/Dept tab."""
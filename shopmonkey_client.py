@@ -1,21 +1,34 @@
 """Async HTTP client for Shopmonkey API."""
 
+import asyncio
 import json
 import os
 import time
 from typing import Any
 
 import httpx
+import orjson
 import structlog
 from tenacity import (
     retry,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
 )
 
 logger = structlog.get_logger(__name__)
 
+# Maximum concurrent requests for batched lookups such as get_canned_services
+MAX_CONCURRENT_REQUESTS = 10
+
+# Connection pool for the default transport. Keep idle connections around
+# longer than httpx's 5s default so bursts of availability checks reuse open connections.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
 
 class ShopmonkeyAPIError(Exception):
     """Base exception for Shopmonkey API errors."""
@@ -49,6 +62,7 @@ class ShopmonkeyClient:
         base_url: str | None = None,
         location_id: str | None = None,
         timeout: float = 30.0,
+        transport: httpx.AsyncBaseTransport | None = None,
     ):
         self.api_token = api_token or os.getenv("SHOPMONKEY_API_TOKEN")
         self.base_url = (
@@ -56,7 +70,13 @@ class ShopmonkeyClient:
             or os.getenv("SHOPMONKEY_API_BASE_URL", "https://api.shopmonkey.cloud")
         ).rstrip("/")
         self.location_id = location_id or os.getenv("SHOPMONKEY_LOCATION_ID")
+        # Query params sent with every location-scoped lookup, built once
+        self._base_params: dict[str, str] = (
+            {"locationId": self.location_id} if self.location_id else {}
+        )
         self.timeout = timeout
+        # Optional shared connection pool; the caller owns it and closes it
+        self._transport = transport
 
         if not self.api_token:
             raise ValueError("SHOPMONKEY_API_TOKEN is required")
@@ -72,18 +92,24 @@ class ShopmonkeyClient:
                     "Content-Type": "application/json",
                 },
                 timeout=self.timeout,
+                limits=HTTP_LIMITS,
+                transport=self._transport,
             )
         return self._client
 
     async def close(self) -> None:
         if self._client:
-            await self._client.aclose()
+            # Closing the httpx client would also close an injected transport
+            if self._transport is None:
+                await self._client.aclose()
             self._client = None
 
     @retry(
         retry=retry_if_exception_type((ShopmonkeyTimeoutError, ShopmonkeyNetworkError)),
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=4),
+        # Exponential backoff (1s, 2s, ...) plus up to 1s of random jitter, capped at
+        # 4s total, so concurrent requests that failed together don't retry in lockstep
+        wait=wait_exponential_jitter(initial=1, max=4, jitter=1),
         reraise=True,
     )
     async def _request(
@@ -96,7 +122,7 @@ class ShopmonkeyClient:
         """
         Make an HTTP request to the Shopmonkey API with retry logic.
 
-        Retries on timeout and network errors with exponential backoff.
+        Retries on timeout and network errors with jittered exponential backoff.
         Does not retry on 4xx client errors.
         """
         client = await self._get_client()
@@ -125,7 +151,8 @@ class ShopmonkeyClient:
             )
 
             response.raise_for_status()
-            return response.json()
+            # orjson decodes the raw body several times faster than response.json()
+            return orjson.loads(response.content)
 
         except httpx.TimeoutException as e:
             elapsed_ms = (time.monotonic() - start_time) * 1000
@@ -162,10 +189,7 @@ class ShopmonkeyClient:
     async def get_bookable_canned_services(self) -> list[dict[str, Any]]:
         """Fetch all canned services marked as bookable."""
         where_clause = json.dumps({"bookable": True})
-        params = {"where": where_clause}
-
-        if self.location_id:
-            params["locationId"] = self.location_id
+        params = {"where": where_clause, **self._base_params}
 
         result = await self._request("GET", "/v3/canned_service", params=params)
         return result.get("data", [])
@@ -180,6 +204,23 @@ class ShopmonkeyClient:
                 return None
             raise
 
+    async def get_canned_services(
+        self, service_ids: list[str]
+    ) -> list[dict[str, Any] | None]:
+        """
+        Fetch several canned services concurrently.
+
+        Returns results in the same order as service_ids, with None for any
+        service that was not found.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def fetch(service_id: str) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self.get_canned_service(service_id)
+
+        return await asyncio.gather(*(fetch(service_id) for service_id in service_ids))
+
     async def get_appointments_for_date(
         self, date_str: str, tech_ids: list[str] | None = None
     ) -> list[dict[str, Any]]:
@@ -198,10 +239,7 @@ class ShopmonkeyClient:
             "startDate": {"$gte": start_date, "$lt": end_date}
         }
 
-        params = {"where": json.dumps(where_clause)}
-
-        if self.location_id:
-            params["locationId"] = self.location_id
+        params = {"where": json.dumps(where_clause), **self._base_params}
 
         result = await self._request("GET", "/v3/appointment", params=params)
         appointments = result.get("data", [])
@@ -228,9 +266,7 @@ class ShopmonkeyClient:
         # Try to find by email first
         if email:
             where_clause = json.dumps({"email": email})
-            params = {"where": where_clause}
-            if self.location_id:
-                params["locationId"] = self.location_id
+            params = {"where": where_clause, **self._base_params}
 
             result = await self._request("GET", "/v3/customer", params=params)
             customers = result.get("data", [])
@@ -240,9 +276,7 @@ class ShopmonkeyClient:
         # Try to find by phone
         if phone:
             where_clause = json.dumps({"phone": phone})
-            params = {"where": where_clause}
-            if self.location_id:
-                params["locationId"] = self.location_id
+            params = {"where": where_clause, **self._base_params}
 
             result = await self._request("GET", "/v3/customer", params=params)
             customers = result.get("data", [])
@@ -276,9 +310,7 @@ class ShopmonkeyClient:
         # Try to find existing vehicle by VIN
         if vin:
             where_clause = json.dumps({"vin": vin})
-            params = {"where": where_clause}
-            if self.location_id:
-                params["locationId"] = self.location_id
+            params = {"where": where_clause, **self._base_params}
 
             result = await self._request("GET", "/v3/vehicle", params=params)
             vehicles = result.get("data", [])
@@ -294,9 +326,7 @@ class ShopmonkeyClient:
                 "model": model,
             }
         )
-        params = {"where": where_clause}
-        if self.location_id:
-            params["locationId"] = self.location_id
+        params = {"where": where_clause, **self._base_params}
 
         result = await self._request("GET", "/v3/vehicle", params=params)
         vehicles = result.get("data", [])
@@ -355,11 +385,7 @@ class ShopmonkeyClient:
 
     async def get_users(self) -> list[dict[str, Any]]:
         """Fetch all users (technicians)."""
-        params = {}
-        if self.location_id:
-            params["locationId"] = self.location_id
-
-        result = await self._request("GET", "/v3/user", params=params if params else None)
+        result = await self._request("GET", "/v3/user", params=self._base_params or None)
         return result.get("data", [])
 
     async def health_check(self) -> bool:
@@ -0,0 +1,11 @@
+"""Shared pytest setup: make the app modules importable and load .env once."""
+
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+load_dotenv()
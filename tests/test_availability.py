@@ -1,13 +1,8 @@
 """Unit tests for availability calculation logic."""
 
 import pytest
-import sys
-from pathlib import Path
 from datetime import datetime, time, timedelta
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from availability import (
     BusinessHours,
     TimeSlot,
@@ -1,11 +1,6 @@
 """Unit tests for department lookup from Shopmonkey labels."""
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from main import get_department_from_service, LABEL_TO_DEPARTMENT
 
@@ -1,15 +1,45 @@
 """Unit tests for FastAPI endpoints using TestClient."""
 
-import os
+import copy
+import json
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 from fastapi.testclient import TestClient
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# A minimal valid /book request body
+BASE_BOOKING = {
+    "service_id": "svc-1",
+    "slot_start": "2026-01-19T09:00:00",
+    "slot_end": "2026-01-19T10:00:00",
+    "customer": {"firstName": "Test", "lastName": "User"},
+    "vehicle": {"year": 2022, "make": "Toyota", "model": "Camry"},
+}
+
+
+def _booking_payload(mutate) -> bytes:
+    """Serialize a mutated copy of BASE_BOOKING to a JSON request body."""
+    booking = copy.deepcopy(BASE_BOOKING)
+    mutate(booking)
+    return json.dumps(booking).encode()
+
+
+# Invalid /book bodies, serialized once at import: (payload, expected status)
+INVALID_BOOKING_PAYLOADS = (
+    pytest.param(
+        _booking_payload(lambda r: r["customer"].update(email="not-an-email")), 422,
+        id="invalid_email",
+    ),
+    pytest.param(
+        _booking_payload(lambda r: r["vehicle"].update(year=1800)), 422,
+        id="invalid_year",
+    ),
+    pytest.param(
+        _booking_payload(lambda r: [r.pop(k) for k in ("slot_end", "customer", "vehicle")]), 422,
+        id="missing_required_fields",
+    ),
+)
 
 
 @pytest.fixture
@@ -74,32 +104,50 @@ def mock_config():
     }
 
 
+@pytest.fixture(scope="module")
+def app():
+    """App without docs/OpenAPI routes, built once for the module."""
+    from main import create_app
+
+    # CORS origins are read when the app is built; ignore any set in .env
+    with pytest.MonkeyPatch.context() as mp:
+        mp.delenv("ALLOWED_ORIGINS", raising=False)
+        return create_app(enable_docs=False)
+
+
 @pytest.fixture
-def test_client(mock_shopmonkey_client, mock_sheets_client, mock_config):
+def patched_main(monkeypatch, mock_shopmonkey_client, mock_sheets_client, mock_config):
+    """Point main's client constructors and config loading at the mocks."""
+    # Clear any existing API_KEY for tests (main reads it at import)
+    monkeypatch.setattr("main.API_KEY", "")
+    monkeypatch.setattr("main.ShopmonkeyClient", lambda *a, **k: mock_shopmonkey_client)
+    monkeypatch.setattr("main.SheetsClient", lambda *a, **k: mock_sheets_client)
+    monkeypatch.setattr("main.load_config", lambda *a, **k: mock_config)
+    monkeypatch.setattr("main.validate_config", lambda *a, **k: None)
+    return monkeypatch
+
+
+@pytest.fixture
+def test_client(app, patched_main):
     """Create a TestClient with mocked dependencies."""
-    # Clear any existing API_KEY environment variable for tests
-    with patch.dict(os.environ, {"API_KEY": "", "ALLOWED_ORIGINS": ""}, clear=False):
-        with patch("main.ShopmonkeyClient", return_value=mock_shopmonkey_client), \
-             patch("main.SheetsClient", return_value=mock_sheets_client), \
-             patch("main.load_config", return_value=mock_config), \
-             patch("main.validate_config"):
-            from main import app
-            with TestClient(app) as client:
-                yield client
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture
-def test_client_with_api_key(mock_shopmonkey_client, mock_sheets_client, mock_config):
+def docs_test_client(patched_main):
+    """Create a TestClient for the default app, which serves the API docs."""
+    from main import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def test_client_with_api_key(app, patched_main):
     """Create a TestClient with API key authentication enabled."""
-    with patch.dict(os.environ, {"API_KEY": "test-api-key-123", "ALLOWED_ORIGINS": ""}, clear=False):
-        with patch("main.ShopmonkeyClient", return_value=mock_shopmonkey_client), \
-             patch("main.SheetsClient", return_value=mock_sheets_client), \
-             patch("main.load_config", return_value=mock_config), \
-             patch("main.validate_config"), \
-             patch("main.API_KEY", "test-api-key-123"):
-            from main import app
-            with TestClient(app) as client:
-                yield client
+    patched_main.setattr("main.API_KEY", "test-api-key-123")
+    with TestClient(app) as client:
+        yield client
 
 
 class TestHealthEndpoint:
@@ -302,43 +350,13 @@ class TestBookEndpoint:
         response = test_client.post("/book", json=booking_request)
         assert response.status_code == 404
 
-    def test_booking_invalid_email_returns_422(self, test_client):
-        """Should return 422 for invalid email format."""
-        booking_request = {
-            "service_id": "svc-1",
-            "slot_start": "2026-01-19T09:00:00",
-            "slot_end": "2026-01-19T10:00:00",
-            "customer": {
-                "firstName": "Test",
-                "lastName": "User",
-                "email": "not-an-email",
-            },
-            "vehicle": {"year": 2022, "make": "Toyota", "model": "Camry"},
-        }
-        response = test_client.post("/book", json=booking_request)
-        assert response.status_code == 422
-
-    def test_booking_invalid_year_returns_422(self, test_client):
-        """Should return 422 for invalid vehicle year."""
-        booking_request = {
-            "service_id": "svc-1",
-            "slot_start": "2026-01-19T09:00:00",
-            "slot_end": "2026-01-19T10:00:00",
-            "customer": {"firstName": "Test", "lastName": "User"},
-            "vehicle": {"year": 1800, "make": "Toyota", "model": "Camry"},
-        }
-        response = test_client.post("/book", json=booking_request)
-        assert response.status_code == 422
-
-    def test_booking_missing_required_fields_returns_422(self, test_client):
-        """Should return 422 when required fields are missing."""
-        booking_request = {
-            "service_id": "svc-1",
-            "slot_start": "2026-01-19T09:00:00",
-            # Missing slot_end, customer, vehicle
-        }
-        response = test_client.post("/book", json=booking_request)
-        assert response.status_code == 422
+    @pytest.mark.parametrize("payload,expected", INVALID_BOOKING_PAYLOADS)
+    def test_booking_invalid_request(self, test_client, payload, expected):
+        """Should reject malformed booking requests."""
+        response = test_client.post(
+            "/book", content=payload, headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == expected
 
     def test_slot_conflict_returns_409(self, test_client, mock_shopmonkey_client):
         """Should return 409 when slot is no longer available."""
@@ -425,20 +443,30 @@ class TestAPIKeyAuthentication:
         assert response.status_code in [200, 404]
 
 
+class TestDocsDisabled:
+    """Tests for apps created with enable_docs=False."""
+
+    def test_docs_disabled(self, test_client):
+        """Should not serve schema or docs when created with enable_docs=False."""
+        assert test_client.get("/openapi.json").status_code == 404
+        assert test_client.get("/docs").status_code == 404
+
+
+@pytest.mark.slow
 class TestOpenAPISchema:
     """Tests for OpenAPI schema generation."""
 
-    def test_openapi_schema_accessible(self, test_client):
+    def test_openapi_schema_accessible(self, docs_test_client):
         """Should be able to access OpenAPI schema."""
-        response = test_client.get("/openapi.json")
+        response = docs_test_client.get("/openapi.json")
         assert response.status_code == 200
         schema = response.json()
         assert schema["info"]["title"] == "Shopmonkey Scheduling API"
         assert schema["info"]["version"] == "1.0.0"
 
-    def test_docs_accessible(self, test_client):
+    def test_docs_accessible(self, docs_test_client):
         """Should be able to access Swagger UI docs."""
-        response = test_client.get("/docs")
+        response = docs_test_client.get("/docs")
         assert response.status_code == 200
 
 
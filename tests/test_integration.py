@@ -1,68 +1,228 @@
 """Integration tests for Shopmonkey scheduler (requires live API access).
 
 These tests hit real APIs and require valid credentials in .env file.
-Run with: pytest tests/test_integration.py -v -s
+Run with: RUN_INTEGRATION=1 pytest tests/test_integration.py -v -s
 """
 
+import os
+
 import pytest
+
+# Skip the whole module (before importing any API clients) unless opted in
+if not os.getenv("RUN_INTEGRATION"):
+    pytest.skip("integration disabled (set RUN_INTEGRATION=1)", allow_module_level=True)
+
+# Skip all tests if credentials aren't available (conftest has loaded .env)
+_missing_env = [
+    name for name in ("SHOPMONKEY_API_TOKEN", "GOOGLE_SHEETS_ID") if not os.getenv(name)
+]
+if _missing_env:
+    pytest.skip(f"missing env: {', '.join(_missing_env)}", allow_module_level=True)
+
 import asyncio
 import sys
-from pathlib import Path
+import time
+from datetime import date, timedelta
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import httpx
+import pytest_asyncio
 
-from dotenv import load_dotenv
-load_dotenv()
+pytestmark = pytest.mark.integration
 
+# Starting per-request timeout for live API calls (seconds). It shrinks to
+# TIMEOUT_LATENCY_FACTOR x the fastest observed response, but never below
+# MIN_TIMEOUT, so a stalled endpoint fails fast instead of hanging the suite.
+INTEGRATION_TIMEOUT = 10.0
+TIMEOUT_LATENCY_FACTOR = 4
+MIN_TIMEOUT = 1.0
+
+# Fixed window for appointment lookups so reruns hit the same (cacheable) queries
+INTEGRATION_PROBE_DATE = os.getenv("INTEGRATION_PROBE_DATE", "2026-01-19")
+INTEGRATION_PROBE_DAYS = 3
+INTEGRATION_PROBE_DATES = [
+    (date.fromisoformat(INTEGRATION_PROBE_DATE) + timedelta(days=i)).isoformat()
+    for i in range(INTEGRATION_PROBE_DAYS)
+]
+
+
+def _install_adaptive_timeout(http_client: httpx.AsyncClient) -> None:
+    """Shrink the client's timeout to a multiple of the fastest response seen."""
+    started: dict[int, float] = {}
+    fastest = INTEGRATION_TIMEOUT
+
+    async def on_request(request: httpx.Request) -> None:
+        started[id(request)] = time.monotonic()
+
+    async def on_response(response: httpx.Response) -> None:
+        nonlocal fastest
+        start = started.pop(id(response.request), None)
+        if start is None:
+            return
+        elapsed = time.monotonic() - start
+        if elapsed < fastest:
+            fastest = elapsed
+            http_client.timeout = httpx.Timeout(
+                max(MIN_TIMEOUT, TIMEOUT_LATENCY_FACTOR * fastest)
+            )
 
-# Skip all tests if credentials aren't available
-pytestmark = pytest.mark.integration
+    http_client.event_hooks["request"].append(on_request)
+    http_client.event_hooks["response"].append(on_response)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run the integration tests on uvloop when it is available (not on Windows)."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            return uvloop.EventLoopPolicy()
+        except ImportError:
+            pass
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
 def sheets_client():
     """Create a SheetsClient instance."""
     from sheets_client import SheetsClient
     return SheetsClient()
 
 
-@pytest.fixture
-async def shopmonkey_client():
-    """Create a ShopmonkeyClient instance."""
+@pytest.fixture(scope="session")
+def sheets_snapshot(sheets_client):
+    """
+    The Tech/Dept tab, read from the Sheets API once per session.
+
+    Everything is derived with SheetsClient's own parsing. The first call fetches
+    the full range; the client caches those rows, so the rest are cache hits.
+    """
+    tech_departments = sheets_client._sync_get_tech_departments()
+    departments = sheets_client._sync_get_all_departments()
+    return {
+        "departments": departments,
+        "tech_departments": tech_departments,
+        "techs_by_dept": {
+            dept: sheets_client._sync_get_techs_for_department(dept) for dept in departments
+        },
+    }
+
+
+@pytest.fixture(scope="session")
+def all_departments(sheets_snapshot):
+    """Department names from the Tech/Dept header."""
+    return sheets_snapshot["departments"]
+
+
+@pytest.fixture(scope="session")
+def tech_departments(sheets_snapshot):
+    """Technician department mappings."""
+    return sheets_snapshot["tech_departments"]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def http_transport():
+    """One keep-alive connection pool for every API client in the session."""
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_connections=20, keepalive_expiry=60)
+    )
+    yield transport
+    await transport.aclose()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shopmonkey_client(http_transport):
+    """
+    Create a ShopmonkeyClient shared by the session (keeps connections warm).
+
+    Keeps the fixed INTEGRATION_TIMEOUT: it is used for writes, which must not
+    be timed out early and retried into duplicate records.
+
+    Async tests using it must run on the session loop:
+    @pytest.mark.asyncio(loop_scope="session").
+    """
     from shopmonkey_client import ShopmonkeyClient
-    client = ShopmonkeyClient()
+    client = ShopmonkeyClient(timeout=INTEGRATION_TIMEOUT, transport=http_transport)
     yield client
     await client.close()
 
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shopmonkey_read_client(http_transport):
+    """A read-only ShopmonkeyClient whose timeout adapts to observed latency."""
+    from shopmonkey_client import ShopmonkeyClient
+    client = ShopmonkeyClient(timeout=INTEGRATION_TIMEOUT, transport=http_transport)
+    _install_adaptive_timeout(await client._get_client())
+    yield client
+    await client.close()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def shopmonkey_reads(shopmonkey_read_client):
+    """
+    Independent read-only Shopmonkey lookups, fetched once per session.
+
+    The requests are issued concurrently, so the session waits for the slowest
+    one rather than the sum of all of them. A failed lookup is stored as its
+    exception; read values through _unwrap so only the test covering that
+    endpoint fails.
+    """
+    services, users, *appointments = await asyncio.gather(
+        shopmonkey_read_client.get_bookable_canned_services(),
+        shopmonkey_read_client.get_users(),
+        *(shopmonkey_read_client.get_appointments_for_date(d) for d in INTEGRATION_PROBE_DATES),
+        return_exceptions=True,
+    )
+    return {
+        "services": services,
+        "users": users,
+        "appointments": dict(zip(INTEGRATION_PROBE_DATES, appointments)),
+    }
+
+
+def _unwrap(result):
+    """Return a shopmonkey_reads value, re-raising the error if its lookup failed."""
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+@pytest.fixture(scope="session")
+def bookable_services(shopmonkey_reads):
+    """Bookable canned services from Shopmonkey."""
+    return _unwrap(shopmonkey_reads["services"])
+
+
+@pytest.fixture(scope="session")
+def service_departments(bookable_services):
+    """Each bookable service paired with the department its labels map to."""
+    from main import get_department_from_service
+    return [(svc, get_department_from_service(svc)) for svc in bookable_services]
+
+
 class TestGoogleSheetsIntegration:
     """Integration tests for Google Sheets API."""
 
-    def test_can_connect_to_sheets(self, sheets_client):
+    def test_can_connect_to_sheets(self, all_departments):
         """Should be able to connect to Google Sheets."""
-        departments = sheets_client._sync_get_all_departments()
-        assert isinstance(departments, list)
-        assert len(departments) > 0
+        assert isinstance(all_departments, list)
+        assert len(all_departments) > 0
 
-    def test_can_get_tech_departments(self, sheets_client):
+    def test_can_get_tech_departments(self, tech_departments):
         """Should be able to get technician department mappings."""
-        tech_data = sheets_client._sync_get_tech_departments()
-        assert isinstance(tech_data, dict)
-        assert len(tech_data) > 0
+        assert isinstance(tech_departments, dict)
+        assert len(tech_departments) > 0
 
         # Each tech should have required fields
-        for tech_id, info in tech_data.items():
+        for tech_id, info in tech_departments.items():
             assert "tech_name" in info
             assert "departments" in info
             assert isinstance(info["departments"], dict)
 
-    def test_can_get_techs_for_department(self, sheets_client):
+    def test_can_get_techs_for_department(self, sheets_snapshot):
         """Should be able to get techs for a specific department."""
-        departments = sheets_client._sync_get_all_departments()
-        if departments:
+        if sheets_snapshot["departments"]:
             # Test with first available department
-            techs = sheets_client._sync_get_techs_for_department(departments[0])
+            techs = sheets_snapshot["techs_by_dept"][sheets_snapshot["departments"][0]]
             assert isinstance(techs, list)
             for tech in techs:
                 assert "tech_id" in tech
@@ -73,10 +233,9 @@ class TestGoogleSheetsIntegration:
 class TestShopmonkeyIntegration:
     """Integration tests for Shopmonkey API."""
 
-    @pytest.mark.asyncio
-    async def test_can_get_bookable_services(self, shopmonkey_client):
-        """Should be able to get bookable canned services."""
-        services = await shopmonkey_client.get_bookable_canned_services()
+    def test_bookable_services_contract(self, bookable_services):
+        """Bookable services should have required fields, and most should have labels."""
+        services = bookable_services
         assert isinstance(services, list)
         assert len(services) > 0
 
@@ -85,89 +244,74 @@ class TestShopmonkeyIntegration:
             assert "id" in svc
             assert "name" in svc
 
-    @pytest.mark.asyncio
-    async def test_services_have_labels(self, shopmonkey_client):
-        """Most services should have labels for department mapping."""
-        services = await shopmonkey_client.get_bookable_canned_services()
-
         labeled = [s for s in services if s.get("labels")]
         unlabeled = [s for s in services if not s.get("labels")]
 
-        # At least 90% should have labels
-        label_rate = len(labeled) / len(services) if services else 0
-        assert label_rate >= 0.9, f"Only {label_rate:.0%} of services have labels"
+        # At least 90% should have labels for department mapping
+        label_rate = len(labeled) / len(services)
+        unlabeled_names = [s.get("name") for s in unlabeled]
+        assert label_rate >= 0.9, (
+            f"Only {label_rate:.0%} of services have labels; missing: {unlabeled_names}"
+        )
 
         if unlabeled:
             print(f"\nWarning: {len(unlabeled)} services without labels:")
-            for s in unlabeled:
-                print(f"  - {s.get('name')}")
+            for name in unlabeled_names:
+                print(f"  - {name}")
 
-    @pytest.mark.asyncio
-    async def test_can_get_users(self, shopmonkey_client):
+    def test_can_get_users(self, shopmonkey_reads):
         """Should be able to get users/technicians."""
-        users = await shopmonkey_client.get_users()
+        users = _unwrap(shopmonkey_reads["users"])
         assert isinstance(users, list)
         assert len(users) > 0
 
-    @pytest.mark.asyncio
-    async def test_can_get_appointments(self, shopmonkey_client):
-        """Should be able to get appointments for a date."""
-        from datetime import datetime
-        today = datetime.now().strftime("%Y-%m-%d")
-        appointments = await shopmonkey_client.get_appointments_for_date(today)
-        assert isinstance(appointments, list)
+    def test_can_get_appointments(self, shopmonkey_reads):
+        """Should be able to get appointments for each date in the probe window."""
+        appointments = shopmonkey_reads["appointments"]
+        assert list(appointments) == INTEGRATION_PROBE_DATES
+        assert all(isinstance(_unwrap(a), list) for a in appointments.values())
 
 
 class TestEndToEndFlow:
     """End-to-end tests for the availability check flow."""
 
-    @pytest.mark.asyncio
-    async def test_service_to_tech_mapping_flow(self, sheets_client, shopmonkey_client):
+    def test_service_to_tech_mapping_flow(self, sheets_snapshot, service_departments):
         """Test the complete service -> department -> technician flow."""
-        from main import get_department_from_service
-
-        # Get a service from Shopmonkey
-        services = await shopmonkey_client.get_bookable_canned_services()
-        assert services, "No bookable services found"
+        assert service_departments, "No bookable services found"
 
         # Find a service with a label
-        labeled_services = [s for s in services if s.get("labels")]
+        labeled_services = [(s, d) for s, d in service_departments if s.get("labels")]
         assert labeled_services, "No services with labels found"
 
-        test_service = labeled_services[0]
+        test_service, department = labeled_services[0]
         service_name = test_service.get("name")
         print(f"\nTesting with service: {service_name}")
 
-        # Get department from label
-        department = get_department_from_service(test_service)
+        # Department comes from the service's label
         assert department, f"No department found for {service_name}"
         print(f"  Department: {department}")
 
         # Get qualified technicians
-        techs = sheets_client._sync_get_techs_for_department(department)
+        techs = sheets_snapshot["techs_by_dept"].get(department, [])
         print(f"  Qualified techs: {[t['tech_name'] for t in techs]}")
 
         # We should have at least one tech (or this department needs setup)
         if not techs:
             pytest.skip(f"No techs assigned to {department} department")
 
-    @pytest.mark.asyncio
-    async def test_all_labeled_services_have_techs(self, sheets_client, shopmonkey_client):
+    def test_all_labeled_services_have_techs(
+        self, sheets_snapshot, service_departments, all_departments
+    ):
         """Verify all labeled services can find qualified technicians."""
-        from main import get_department_from_service
-
-        services = await shopmonkey_client.get_bookable_canned_services()
-        available_depts = set(sheets_client._sync_get_all_departments())
+        available_depts = set(all_departments)
+        staffed_depts = {d for d, techs in sheets_snapshot["techs_by_dept"].items() if techs}
 
         issues = []
-        for svc in services:
-            dept = get_department_from_service(svc)
+        for svc, dept in service_departments:
             if dept and dept not in available_depts:
                 issues.append(f"{svc.get('name')}: department '{dept}' not in sheet")
-            elif dept:
-                techs = sheets_client._sync_get_techs_for_department(dept)
-                if not techs:
-                    issues.append(f"{svc.get('name')}: no techs for '{dept}'")
+            elif dept and dept not in staffed_depts:
+                issues.append(f"{svc.get('name')}: no techs for '{dept}'")
 
         if issues:
             print("\nMapping issues found:")
@@ -175,7 +319,7 @@ class TestEndToEndFlow:
                 print(f"  - {issue}")
 
         # Allow some issues but flag if too many
-        issue_rate = len(issues) / len(services) if services else 0
+        issue_rate = len(issues) / len(service_departments) if service_departments else 0
         assert issue_rate < 0.2, f"{len(issues)} services have mapping issues"
 
 
@@ -183,7 +327,7 @@ class TestBookingIntegration:
     """
     Integration tests that create real bookings.
 
-    Run with: pytest tests/test_integration.py::TestBookingIntegration -v -s -m booking
+    Run with: RUN_INTEGRATION=1 pytest tests/test_integration.py::TestBookingIntegration -v -s -m booking
 
     WARNING: These tests create real appointments in Shopmonkey.
     They clean up after themselves, but use with caution.
@@ -202,9 +346,9 @@ class TestBookingIntegration:
         "model": "IntegrationModel",
     }
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     @pytest.mark.booking
-    async def test_complete_booking_flow(self, shopmonkey_client, sheets_client):
+    async def test_complete_booking_flow(self, shopmonkey_client, sheets_snapshot, bookable_services):
         """
         Test the complete booking flow:
         1. Get a bookable service with a label
@@ -225,15 +369,15 @@ class TestBookingIntegration:
         try:
             # Step 1: Get a bookable service with a label
             print("\n1. Finding a bookable service with a label...")
-            services = await shopmonkey_client.get_bookable_canned_services()
+            services = bookable_services
             assert services, "No bookable services found"
 
             labeled_services = [s for s in services if s.get("labels")]
             assert labeled_services, "No services with labels found"
 
             test_service = labeled_services[0]
-            service_id = test_service.get("id")
-            service_name = test_service.get("name")
+            service_id = test_service["id"]
+            service_name = test_service["name"]
             print(f"   Selected service: {service_name} ({service_id})")
 
             # Step 2: Get department and qualified techs
@@ -242,7 +386,7 @@ class TestBookingIntegration:
             assert department, f"No department found for {service_name}"
             print(f"   Department: {department}")
 
-            techs = sheets_client._sync_get_techs_for_department(department)
+            techs = sheets_snapshot["techs_by_dept"].get(department, [])
             if not techs:
                 pytest.skip(f"No techs assigned to {department} department")
 
@@ -278,8 +422,8 @@ class TestBookingIntegration:
             start_time = future_date.replace(hour=9, minute=0, second=0, microsecond=0)
             end_time = start_time + timedelta(hours=2)
 
-            start_iso = start_time.strftime("%Y-%m-%dT%H:%M:%S") + ".000Z"
-            end_iso = end_time.strftime("%Y-%m-%dT%H:%M:%S") + ".000Z"
+            start_iso = start_time.isoformat(timespec="milliseconds") + "Z"
+            end_iso = end_time.isoformat(timespec="milliseconds") + "Z"
 
             # Generate confirmation number like main.py does
             import uuid
@@ -287,11 +431,13 @@ class TestBookingIntegration:
             unique_part = uuid.uuid4().hex[:6].upper()
             confirmation_number = f"SM-{date_part}-{unique_part}"
 
-            work_order_notes = f"""*** ONLINE BOOKING ***
-Confirmation: {confirmation_number}
-
-Service requested: {service_name}
-Booked online via scheduling API."""
+            work_order_notes = "\n".join((
+                "*** ONLINE BOOKING ***",
+                f"Confirmation: {confirmation_number}",
+                "",
+                f"Service requested: {service_name}",
+                "Booked online via scheduling API.",
+            ))
 
             appointment = await shopmonkey_client.create_appointment(
                 customer_id=customer_id,
@@ -1,35 +1,60 @@
 """Unit tests for Google Sheets client with mocked API."""
 
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+
+@pytest.fixture(autouse=True)
+def patched_sheets(monkeypatch):
+    """
+    Stub out credentials and the Sheets API service for every test.
+
+    Yields the mocked ``spreadsheets().values().get().execute``; tests usually
+    set its rows through ``set_values`` and only inspect it for call counts.
+    """
+    from sheets_client import _build_service
+
+    service = MagicMock()
+    monkeypatch.setattr(
+        "sheets_client.service_account.Credentials.from_service_account_file", MagicMock()
+    )
+    monkeypatch.setattr("sheets_client.build", lambda *a, **kw: service)
+    # The built service is shared per credentials path; don't leak it between tests
+    _build_service.cache_clear()
+    yield service.spreadsheets.return_value.values.return_value.get.return_value.execute
+    _build_service.cache_clear()
+
+
+@pytest.fixture
+def set_values(patched_sheets):
+    """Set the rows the mocked Sheets API returns on its next read."""
+
+    def _set_values(rows):
+        patched_sheets.return_value = {"values": rows}
+
+    return _set_values
+
+
+@pytest.fixture
+def client(patched_sheets):
+    """A SheetsClient wired to the patched Sheets service."""
+    from sheets_client import SheetsClient
+
+    return SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
 
 
 class TestSheetsClientGetTechDepartments:
     """Tests for get_tech_departments method (sync version)."""
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_parses_tech_departments_correctly(self, mock_build, mock_creds):
+    def test_parses_tech_departments_correctly(self, client, set_values):
         """Should correctly parse technician department mappings."""
-        from sheets_client import SheetsClient
-
         # Mock the sheets API response
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Vinyl", "Alignment", "Tint", "Detail", "Status"],
-                ["John Doe", "tech-123", "Technician", "TRUE", "FALSE", "TRUE", "FALSE", "Active"],
-                ["Jane Smith", "tech-456", "Technician", "FALSE", "TRUE", "FALSE", "TRUE", "Active"],
-            ]
-        }
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
+        set_values([
+            ["Name", "ID", "Role", "Vinyl", "Alignment", "Tint", "Detail", "Status"],
+            ["John Doe", "tech-123", "Technician", "TRUE", "FALSE", "TRUE", "FALSE", "Active"],
+            ["Jane Smith", "tech-456", "Technician", "FALSE", "TRUE", "FALSE", "TRUE", "Active"],
+        ])
+
         # Use the sync internal method for testing
         result = client._sync_get_tech_departments()
 
@@ -44,72 +69,78 @@ class TestSheetsClientGetTechDepartments:
         assert result["tech-456"]["departments"]["Alignment"] == 1
         assert result["tech-456"]["departments"]["Detail"] == 1
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_filters_inactive_technicians(self, mock_build, mock_creds):
+    def test_filters_inactive_technicians(self, client, set_values):
         """Should filter out inactive technicians."""
-        from sheets_client import SheetsClient
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Status"],
+            ["Active Tech", "tech-1", "Technician", "TRUE", "Active"],
+            ["Inactive Tech", "tech-2", "Technician", "TRUE", "Inactive"],
+        ])
 
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Detail", "Status"],
-                ["Active Tech", "tech-1", "Technician", "TRUE", "Active"],
-                ["Inactive Tech", "tech-2", "Technician", "TRUE", "Inactive"],
-            ]
-        }
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = client._sync_get_tech_departments()
 
         assert "tech-1" in result
         assert "tech-2" not in result
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_skips_rows_without_tech_id(self, mock_build, mock_creds):
+    def test_short_rows_default_missing_departments_to_zero(self, client, set_values):
+        """Should treat department cells missing from a short row as not qualified."""
+        set_values([
+            ["Name", "ID", "Role", "Vinyl", "Tint", "Detail"],
+            ["Short Row", "tech-1", "Technician", "2"],
+        ])
+
+        result = client._sync_get_tech_departments()
+
+        assert result["tech-1"]["departments"] == {"Vinyl": 2, "Tint": 0, "Detail": 0}
+
+    def test_skips_rows_without_tech_id(self, client, set_values):
         """Should skip rows without a tech ID."""
-        from sheets_client import SheetsClient
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Status"],
+            ["Valid Tech", "tech-1", "Technician", "TRUE", "Active"],
+            ["No ID Tech", "", "Technician", "TRUE", "Active"],
+        ])
 
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Detail", "Status"],
-                ["Valid Tech", "tech-1", "Technician", "TRUE", "Active"],
-                ["No ID Tech", "", "Technician", "TRUE", "Active"],
-            ]
-        }
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = client._sync_get_tech_departments()
 
         assert "tech-1" in result
         assert len(result) == 1
 
 
+class TestParsePriority:
+    """Tests for Tech/Dept cell parsing."""
+
+    @pytest.mark.parametrize(
+        ("cell", "expected"),
+        [
+            ("TRUE", 1),
+            (" yes ", 1),
+            ("x", 1),
+            ("False", 0),
+            ("no", 0),
+            ("", 0),
+            ("2", 2),
+            ("n/a", 0),
+        ],
+    )
+    def test_parses_boolean_and_priority_values(self, cell, expected):
+        """Should accept the old boolean format (any case) and numeric priorities."""
+        from sheets_client import _parse_priority
+
+        assert _parse_priority(cell) == expected
+
+
 class TestSheetsClientGetTechsForDepartment:
     """Tests for get_techs_for_department method."""
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_returns_qualified_techs(self, mock_build, mock_creds):
+    def test_returns_qualified_techs(self, client, set_values):
         """Should return only techs qualified for the department."""
-        from sheets_client import SheetsClient
-
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Detail", "Tint", "Status"],
-                ["Detail Tech", "tech-1", "Technician", "TRUE", "FALSE", "Active"],
-                ["Tint Tech", "tech-2", "Technician", "FALSE", "TRUE", "Active"],
-                ["Both Tech", "tech-3", "Technician", "TRUE", "TRUE", "Active"],
-            ]
-        }
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Tint", "Status"],
+            ["Detail Tech", "tech-1", "Technician", "TRUE", "FALSE", "Active"],
+            ["Tint Tech", "tech-2", "Technician", "FALSE", "TRUE", "Active"],
+            ["Both Tech", "tech-3", "Technician", "TRUE", "TRUE", "Active"],
+        ])
 
         detail_techs = client._sync_get_techs_for_department("Detail")
         assert len(detail_techs) == 2
@@ -122,43 +153,25 @@ class TestSheetsClientGetTechsForDepartment:
             assert "priority" in tech
             assert tech["priority"] == 1  # TRUE maps to priority 1
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_returns_empty_for_unknown_department(self, mock_build, mock_creds):
+    def test_returns_empty_for_unknown_department(self, client, set_values):
         """Should return empty list for unknown department."""
-        from sheets_client import SheetsClient
-
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Detail", "Status"],
-                ["Tech", "tech-1", "Technician", "TRUE", "Active"],
-            ]
-        }
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Status"],
+            ["Tech", "tech-1", "Technician", "TRUE", "Active"],
+        ])
 
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = client._sync_get_techs_for_department("Unknown")
         assert result == []
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_returns_techs_sorted_by_priority(self, mock_build, mock_creds):
+    def test_returns_techs_sorted_by_priority(self, client, set_values):
         """Should return techs sorted by priority (1=highest first)."""
-        from sheets_client import SheetsClient
+        set_values([
+            ["Name", "ID", "Role", "Alignment", "Status"],
+            ["Low Priority", "tech-3", "Technician", "3", "Active"],
+            ["High Priority", "tech-1", "Technician", "1", "Active"],
+            ["Med Priority", "tech-2", "Technician", "2", "Active"],
+        ])
 
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Alignment", "Status"],
-                ["Low Priority", "tech-3", "Technician", "3", "Active"],
-                ["High Priority", "tech-1", "Technician", "1", "Active"],
-                ["Med Priority", "tech-2", "Technician", "2", "Active"],
-            ]
-        }
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         techs = client._sync_get_techs_for_department("Alignment")
 
         assert len(techs) == 3
@@ -170,67 +183,84 @@ class TestSheetsClientGetTechsForDepartment:
         assert techs[2]["tech_id"] == "tech-3"
         assert techs[2]["priority"] == 3
 
+    def test_reuses_department_index_until_cache_cleared(self, client, set_values):
+        """Should parse the sheet once for repeated lookups and rebuild after clear_cache."""
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Tint", "Status"],
+            ["Tech", "tech-1", "Technician", "TRUE", "FALSE", "Active"],
+        ])
+
+        index = client._sync_get_techs_by_department()
+        assert client._sync_get_techs_by_department() is index
+        assert [t["tech_id"] for t in client._sync_get_techs_for_department("Detail")] == ["tech-1"]
+        assert client._sync_get_techs_for_department("Tint") == []
+
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Tint", "Status"],
+            ["Tech", "tech-1", "Technician", "FALSE", "TRUE", "Active"],
+        ])
+        client.clear_cache()
+
+        assert client._sync_get_techs_for_department("Detail") == []
+        assert [t["tech_id"] for t in client._sync_get_techs_for_department("Tint")] == ["tech-1"]
+
 
 class TestSheetsClientGetAllDepartments:
     """Tests for get_all_departments method."""
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_returns_department_columns(self, mock_build, mock_creds):
+    def test_returns_department_columns(self, client, set_values):
         """Should return department column names."""
-        from sheets_client import SheetsClient
-
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Vinyl", "Alignment", "Window Tint", "Detail", "Bedliner", "Status"]
-            ]
-        }
+        set_values([
+            ["Name", "ID", "Role", "Vinyl", "Alignment", "Window Tint", "Detail", "Bedliner", "Status"]
+        ])
 
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = client._sync_get_all_departments()
 
         assert result == ["Vinyl", "Alignment", "Window Tint", "Detail", "Bedliner"]
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_returns_empty_when_no_data(self, mock_build, mock_creds):
-        """Should return empty list when no header row."""
-        from sheets_client import SheetsClient
+    def test_shares_fetch_with_tech_departments(self, client, patched_sheets, set_values):
+        """Should reuse the cached Tech/Dept read instead of fetching the header again."""
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Status"],
+            ["Tech", "tech-1", "Technician", "TRUE", "Active"],
+        ])
+
+        client._sync_get_tech_departments()
+        result = client._sync_get_all_departments()
 
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": []
-        }
+        assert result == ["Detail"]
+        assert patched_sheets.call_count == 1
+
+    def test_returns_empty_when_no_data(self, client, set_values):
+        """Should return empty list when no header row."""
+        set_values([])
 
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = client._sync_get_all_departments()
 
         assert result == []
 
 
+class TestSheetsClientService:
+    """Tests for Sheets API service construction."""
+
+    def test_clients_share_service_for_same_credentials(self, client):
+        """Should build the Sheets service once per credentials path."""
+        from sheets_client import SheetsClient
+
+        other = SheetsClient(spreadsheet_id="other-id", credentials_path="test.json")
+        assert other._get_service() is client._get_service()
+
+
 class TestSheetsClientNormalizeDepartment:
     """Tests for _normalize_department method."""
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_normalizes_alignment_tech(self, mock_build, mock_creds):
+    def test_normalizes_alignment_tech(self, client):
         """Should normalize 'Alignment/Tech' to 'Alignment'."""
-        from sheets_client import SheetsClient
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = client._normalize_department("Alignment/Tech")
         assert result == "Alignment"
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_returns_unchanged_when_no_mapping(self, mock_build, mock_creds):
+    def test_returns_unchanged_when_no_mapping(self, client):
         """Should return unchanged when no mapping exists."""
-        from sheets_client import SheetsClient
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = client._normalize_department("Detail")
         assert result == "Detail"
 
@@ -239,22 +269,13 @@ class TestSheetsClientAsync:
     """Tests for async wrapper methods."""
 
     @pytest.mark.asyncio
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    async def test_async_get_techs_for_department(self, mock_build, mock_creds):
+    async def test_async_get_techs_for_department(self, client, set_values):
         """Should return techs via async method."""
-        from sheets_client import SheetsClient
-
-        mock_service = MagicMock()
-        mock_build.return_value = mock_service
-        mock_service.spreadsheets.return_value.values.return_value.get.return_value.execute.return_value = {
-            "values": [
-                ["Name", "ID", "Role", "Detail", "Status"],
-                ["Tech", "tech-1", "Technician", "TRUE", "Active"],
-            ]
-        }
+        set_values([
+            ["Name", "ID", "Role", "Detail", "Status"],
+            ["Tech", "tech-1", "Technician", "TRUE", "Active"],
+        ])
 
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         result = await client.get_techs_for_department("Detail")
         assert len(result) == 1
         assert result[0]["tech_id"] == "tech-1"
@@ -263,13 +284,8 @@ class TestSheetsClientAsync:
 class TestSheetsClientCache:
     """Tests for cache functionality."""
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_cache_status(self, mock_build, mock_creds):
+    def test_cache_status(self, client):
         """Should return cache status information."""
-        from sheets_client import SheetsClient
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
         status = client.get_cache_status()
 
         assert "cache_size" in status
@@ -277,14 +293,8 @@ class TestSheetsClientCache:
         assert "cache_maxsize" in status
         assert status["cache_ttl_seconds"] == 300
 
-    @patch("sheets_client.service_account.Credentials.from_service_account_file")
-    @patch("sheets_client.build")
-    def test_clear_cache(self, mock_build, mock_creds):
+    def test_clear_cache(self, client):
         """Should clear cache when clear_cache is called."""
-        from sheets_client import SheetsClient
-
-        client = SheetsClient(spreadsheet_id="test-id", credentials_path="test.json")
-
         # Manually add something to cache
         client._cache["test_key"] = "test_value"
         assert len(client._cache) == 1
@@ -1,15 +1,11 @@
 """Unit tests for Shopmonkey client with retry logic and error handling."""
 
+import json
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 import httpx
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from shopmonkey_client import (
     ShopmonkeyClient,
     ShopmonkeyAPIError,
@@ -18,6 +14,14 @@ from shopmonkey_client import (
 )
 
 
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch):
+    """Skip the real backoff between retries; returns the mock that replaced it."""
+    sleep = AsyncMock()
+    monkeypatch.setattr(ShopmonkeyClient._request.retry, "sleep", sleep)
+    return sleep
+
+
 class TestShopmonkeyClientInit:
     """Tests for ShopmonkeyClient initialization."""
 
@@ -42,6 +46,18 @@ class TestShopmonkeyClientInit:
         client = ShopmonkeyClient(api_token="test-token", timeout=60.0)
         assert client.timeout == 60.0
 
+    @pytest.mark.asyncio
+    async def test_close_leaves_injected_transport_open(self):
+        """Should use an injected transport without closing it on close()."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"data": []}))
+        transport.aclose = AsyncMock()
+        client = ShopmonkeyClient(api_token="test-token", transport=transport)
+
+        assert await client.get_users() == []
+        await client.close()
+
+        transport.aclose.assert_not_awaited()
+
 
 class TestShopmonkeyAPIError:
     """Tests for custom exception classes."""
@@ -64,105 +80,98 @@ class TestShopmonkeyAPIError:
         assert "network" in str(error).lower()
 
 
+def _mock_client(handler, **kwargs) -> ShopmonkeyClient:
+    """Create a ShopmonkeyClient whose HTTP calls are answered in-process by handler."""
+    return ShopmonkeyClient(
+        api_token="test-token",
+        base_url="https://api.test",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+def _replay(*outcomes):
+    """
+    MockTransport handler that answers with each outcome in turn.
+
+    Exceptions are raised, responses returned; the last outcome repeats. The
+    requests seen are recorded on ``handler.requests``.
+    """
+    queue = list(outcomes)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        handler.requests.append(request)
+        outcome = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    handler.requests = []
+    return handler
+
+
 class TestShopmonkeyClientRetry:
     """Tests for retry logic in ShopmonkeyClient."""
 
     @pytest.mark.asyncio
     async def test_retries_on_timeout(self):
         """Should retry on timeout exceptions."""
-        client = ShopmonkeyClient(api_token="test-token")
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": []}
-        mock_response.raise_for_status = MagicMock()
-
         # First call times out, second succeeds
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(
-            side_effect=[
-                httpx.TimeoutException("Connection timed out"),
-                mock_response,
-            ]
+        handler = _replay(
+            httpx.TimeoutException("Connection timed out"),
+            httpx.Response(200, json={"data": []}),
         )
+        client = _mock_client(handler)
 
-        with patch.object(client, "_get_client", return_value=mock_client):
-            result = await client._request("GET", "/test")
-            assert result == {"data": []}
-            assert mock_client.request.call_count == 2
+        result = await client._request("GET", "/test")
+        assert result == {"data": []}
+        assert len(handler.requests) == 2
 
         await client.close()
 
     @pytest.mark.asyncio
     async def test_retries_on_network_error(self):
         """Should retry on network errors."""
-        client = ShopmonkeyClient(api_token="test-token")
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": "success"}
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(
-            side_effect=[
-                httpx.NetworkError("Connection reset"),
-                mock_response,
-            ]
+        handler = _replay(
+            httpx.NetworkError("Connection reset"),
+            httpx.Response(200, json={"data": "success"}),
         )
+        client = _mock_client(handler)
 
-        with patch.object(client, "_get_client", return_value=mock_client):
-            result = await client._request("GET", "/test")
-            assert result == {"data": "success"}
-            assert mock_client.request.call_count == 2
+        result = await client._request("GET", "/test")
+        assert result == {"data": "success"}
+        assert len(handler.requests) == 2
 
         await client.close()
 
     @pytest.mark.asyncio
     async def test_does_not_retry_on_client_error(self):
         """Should not retry on 4xx client errors."""
-        client = ShopmonkeyClient(api_token="test-token")
-
-        mock_response = MagicMock()
-        mock_response.status_code = 400
-        mock_response.text = '{"error": "bad request"}'
-        mock_response.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError(
-                "400 Bad Request",
-                request=MagicMock(),
-                response=mock_response,
-            )
-        )
-
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(return_value=mock_response)
+        handler = _replay(httpx.Response(400, text='{"error": "bad request"}'))
+        client = _mock_client(handler)
 
-        with patch.object(client, "_get_client", return_value=mock_client):
-            with pytest.raises(ShopmonkeyAPIError) as exc_info:
-                await client._request("GET", "/test")
+        with pytest.raises(ShopmonkeyAPIError) as exc_info:
+            await client._request("GET", "/test")
 
-            assert exc_info.value.status_code == 400
-            # Should only be called once (no retry)
-            assert mock_client.request.call_count == 1
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.response_body == '{"error": "bad request"}'
+        # Should only be called once (no retry)
+        assert len(handler.requests) == 1
 
         await client.close()
 
     @pytest.mark.asyncio
-    async def test_raises_after_max_retries(self):
+    async def test_raises_after_max_retries(self, no_retry_sleep):
         """Should raise exception after max retries exhausted."""
-        client = ShopmonkeyClient(api_token="test-token")
-
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(
-            side_effect=httpx.TimeoutException("Always times out")
-        )
+        handler = _replay(httpx.TimeoutException("Always times out"))
+        client = _mock_client(handler)
 
-        with patch.object(client, "_get_client", return_value=mock_client):
-            with pytest.raises(ShopmonkeyTimeoutError):
-                await client._request("GET", "/test")
+        with pytest.raises(ShopmonkeyTimeoutError):
+            await client._request("GET", "/test")
 
-            # Should have tried 3 times (max retries)
-            assert mock_client.request.call_count == 3
+        # Should have tried 3 times (max retries), backing off between attempts
+        assert len(handler.requests) == 3
+        assert no_retry_sleep.await_count == 2
 
         await client.close()
 
@@ -173,86 +182,58 @@ class TestShopmonkeyClientMethods:
     @pytest.mark.asyncio
     async def test_get_canned_service_returns_none_on_404(self):
         """Should return None when service not found (404)."""
-        client = ShopmonkeyClient(api_token="test-token")
+        client = _mock_client(_replay(httpx.Response(404, text='{"error": "not found"}')))
 
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.text = '{"error": "not found"}'
-        mock_response.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError(
-                "404 Not Found",
-                request=MagicMock(),
-                response=mock_response,
-            )
-        )
-
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(return_value=mock_response)
-
-        with patch.object(client, "_get_client", return_value=mock_client):
-            result = await client.get_canned_service("nonexistent-id")
-            assert result is None
+        result = await client.get_canned_service("nonexistent-id")
+        assert result is None
 
         await client.close()
 
     @pytest.mark.asyncio
     async def test_get_canned_service_raises_on_other_errors(self):
         """Should raise on non-404 errors."""
-        client = ShopmonkeyClient(api_token="test-token")
+        client = _mock_client(_replay(httpx.Response(500, text='{"error": "internal error"}')))
 
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.text = '{"error": "internal error"}'
-        mock_response.raise_for_status = MagicMock(
-            side_effect=httpx.HTTPStatusError(
-                "500 Internal Server Error",
-                request=MagicMock(),
-                response=mock_response,
-            )
-        )
+        with pytest.raises(ShopmonkeyAPIError) as exc_info:
+            await client.get_canned_service("service-id")
+        assert exc_info.value.status_code == 500
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_get_canned_services_fetches_each_id_in_order(self):
+        """Should fetch every ID and return results in request order, None for 404s."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            service_id = request.url.path.rsplit("/", 1)[-1]
+            if service_id == "missing":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"data": {"id": service_id}})
 
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(return_value=mock_response)
+        client = _mock_client(handler)
 
-        with patch.object(client, "_get_client", return_value=mock_client):
-            with pytest.raises(ShopmonkeyAPIError) as exc_info:
-                await client.get_canned_service("service-id")
-            assert exc_info.value.status_code == 500
+        result = await client.get_canned_services(["svc-1", "missing", "svc-2"])
+        assert result == [{"id": "svc-1"}, None, {"id": "svc-2"}]
 
         await client.close()
 
     @pytest.mark.asyncio
     async def test_health_check_returns_true_on_success(self):
         """Should return True when API is reachable."""
-        client = ShopmonkeyClient(api_token="test-token")
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": []}
-        mock_response.raise_for_status = MagicMock()
+        client = _mock_client(_replay(httpx.Response(200, json={"data": []})))
 
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(return_value=mock_response)
-
-        with patch.object(client, "_get_client", return_value=mock_client):
-            result = await client.health_check()
-            assert result is True
+        result = await client.health_check()
+        assert result is True
 
         await client.close()
 
     @pytest.mark.asyncio
     async def test_health_check_returns_false_on_failure(self):
         """Should return False when API is not reachable."""
-        client = ShopmonkeyClient(api_token="test-token")
-
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(
-            side_effect=httpx.TimeoutException("Connection timed out")
-        )
+        client = _mock_client(_replay(httpx.TimeoutException("Connection timed out")))
 
-        with patch.object(client, "_get_client", return_value=mock_client):
-            result = await client.health_check()
-            assert result is False
+        result = await client.health_check()
+        assert result is False
 
         await client.close()
 
@@ -263,22 +244,89 @@ class TestShopmonkeyClientLocationId:
     @pytest.mark.asyncio
     async def test_includes_location_id_in_requests(self):
         """Should include locationId in API requests when configured."""
-        client = ShopmonkeyClient(api_token="test-token", location_id="loc-123")
+        handler = _replay(httpx.Response(200, json={"data": []}))
+        client = _mock_client(handler, location_id="loc-123")
+
+        await client.get_bookable_canned_services()
+
+        # Check that locationId was included in params
+        assert handler.requests[0].url.params["locationId"] == "loc-123"
+
+        await client.close()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": []}
-        mock_response.raise_for_status = MagicMock()
+    @pytest.mark.asyncio
+    async def test_location_id_added_alongside_where_clause(self):
+        """Should send locationId with both filtered and unfiltered lookups."""
+        handler = _replay(httpx.Response(200, json={"data": []}))
+        client = _mock_client(handler, location_id="loc-123")
+
+        await client.get_appointments_for_date("2026-01-19")
+        await client.get_users()
+
+        appointments_params, users_params = (r.url.params for r in handler.requests)
+        assert appointments_params["locationId"] == "loc-123"
+        assert "where" in appointments_params
+        assert dict(users_params) == {"locationId": "loc-123"}
+
+        await client.close()
+
+
+class TestShopmonkeyClientResponses:
+    """Tests for request shape and response parsing against canned API payloads."""
+
+    @pytest.mark.asyncio
+    async def test_get_bookable_canned_services(self):
+        """Should request bookable services and return the data list."""
+        services = [
+            {"id": "svc-1", "name": "Window Tint", "labels": [{"name": "Window Tint"}]},
+            {"id": "svc-2", "name": "Detail", "labels": [{"name": "Detail"}]},
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/v3/canned_service"
+            assert json.loads(request.url.params["where"]) == {"bookable": True}
+            return httpx.Response(200, json={"data": services})
+
+        client = _mock_client(handler)
+        result = await client.get_bookable_canned_services()
+        assert result == services
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_get_users(self):
+        """Should return the users data list."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/v3/user"
+            assert request.headers["Authorization"] == "Bearer test-token"
+            return httpx.Response(200, json={"data": [{"id": "user-1"}]})
 
-        mock_client = AsyncMock()
-        mock_client.request = AsyncMock(return_value=mock_response)
+        client = _mock_client(handler)
+        assert await client.get_users() == [{"id": "user-1"}]
 
-        with patch.object(client, "_get_client", return_value=mock_client):
-            await client.get_bookable_canned_services()
+        await client.close()
 
-            # Check that locationId was included in params
-            call_args = mock_client.request.call_args
-            params = call_args.kwargs.get("params", {})
-            assert params.get("locationId") == "loc-123"
+    @pytest.mark.asyncio
+    async def test_get_appointments_for_date_filters_by_tech(self):
+        """Should query the full day and keep only appointments for the given techs."""
+        appointments = [
+            {"id": "appt-1", "technicianId": "tech-1"},
+            {"id": "appt-2", "userId": "tech-2"},
+            {"id": "appt-3", "technicianId": "tech-3"},
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/v3/appointment"
+            where = json.loads(request.url.params["where"])
+            assert where["startDate"] == {
+                "$gte": "2026-01-19T00:00:00Z",
+                "$lt": "2026-01-19T23:59:59Z",
+            }
+            return httpx.Response(200, json={"data": appointments})
+
+        client = _mock_client(handler)
+        result = await client.get_appointments_for_date("2026-01-19", ["tech-1", "tech-2"])
+        assert [a["id"] for a in result] == ["appt-1", "appt-2"]
 
         await client.close()